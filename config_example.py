@@ -27,3 +27,7 @@ SEND_STATUS_REPORTS = False
 
 # Server name to include in alerts and status reports (optional - defaults to "Server")
 SERVER_NAME = "My Server"
+
+# Skip other filesystems mounted under the monitored directories, like du --one-file-system
+# (optional - defaults to True). Keeps slow network or FUSE mounts from stalling a check
+ONE_FILE_SYSTEM = True
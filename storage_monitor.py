@@ -5,23 +5,46 @@ Monitors specific directories and system storage, sends Discord alerts via webho
 """
 
 import os
+import asyncio
 import json
-import shutil
 import subprocess
-import urllib.request
+import http.client
+import urllib.parse
 import time
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+
+_GB = 1 << 30  # Bytes per GB
+_DISCORD_MAX_CONTENT = 2000  # Discord webhook message content limit (characters)
+_DU_TIMEOUT_SECONDS = 120  # Longest a single du run may take before the check is failed
+_WEBHOOK_IDLE_SECONDS = 60  # Reconnect instead of reusing a webhook connection idle this long
+_STATE_LOG_MAX_BYTES = 64 * 1024  # Compact the state log into the snapshot past this size
+_STATE_LOG_TAIL_BYTES = 4096  # Enough of the log's end to hold the last record
+
+
+async def _resolved(value):
+    """Awaitable for a value that is already known, so it can sit alongside real probes."""
+    return value
 
 
 class StorageMonitor:
+    EMOJI_MAP = {'warning': '⚠️', 'critical': '🚨', 'normal': '✅'}
+    
     def __init__(self, webhook_url: str, state_file: str = "storage_monitor_state.json", 
-                 send_status_reports: bool = False, server_name: str = "Server"):
+                 send_status_reports: bool = False, server_name: str = "Server",
+                 custom_thresholds: Optional[Dict[str, Dict[str, float]]] = None,
+                 one_file_system: bool = True):
         self.webhook_url = webhook_url
         self.state_file = state_file
         self.send_status_reports = send_status_reports
         self.server_name = server_name
+        self.one_file_system = one_file_system  # Don't descend into other mounts (like du -x)
         self.home_dir = Path.home()
+        # Plain string forms for the traversal code, which works on str paths throughout
+        self._home_str = os.fspath(self.home_dir)
+        self._layer_str = os.path.join(self._home_str, ".layer")
+        self._webhook_conn: Optional[http.client.HTTPConnection] = None
+        self._webhook_last_used = 0.0
         
         # Thresholds (in GB for directories, % for system storage)
         self.thresholds = {
@@ -30,187 +53,349 @@ class StorageMonitor:
             'journal_logs': {'warning': 5.0, 'critical': 10.0},  # GB
             'system_storage': {'warning': 80.0, 'critical': 95.0}  # %
         }
+        if custom_thresholds:
+            self.thresholds.update(custom_thresholds)
+        
+        # Thresholds are fixed from here on; keep (warning, critical) pairs for the per-check comparisons
+        self._level_bounds = {
+            metric_key: (levels['warning'], levels['critical'])
+            for metric_key, levels in self.thresholds.items()
+        }
         
         self.last_states = self.load_state()
     
     def load_state(self) -> Dict[str, str]:
-        """Load last alert states from file."""
+        """Load last alert states from the snapshot file and its append-only log."""
+        states = {}
         try:
             if os.path.exists(self.state_file):
                 with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                    states = json.load(f)
         except Exception:
             pass
-        return {}
+        
+        # The newest log record, if any, supersedes the snapshot; only the tail of the log is read
+        log_file = self.state_file + '.log'
+        try:
+            with open(log_file, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - _STATE_LOG_TAIL_BYTES))
+                tail = f.read()
+            for line in reversed(tail.splitlines()):
+                try:
+                    return json.loads(line)['states']
+                except (ValueError, KeyError, TypeError):
+                    continue  # Torn last write or partial first line of the tail
+        except OSError:
+            pass
+        return states
     
     def save_state(self):
-        """Save current alert states to file."""
+        """Append current alert states to the state log, compacting it into the snapshot when large."""
+        log_file = self.state_file + '.log'
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.last_states, f, indent=2)
+            record = {"ts": time.time(), "states": self.last_states}
+            with open(log_file, 'ab') as f:
+                f.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+                log_size = f.tell()
+            
+            if log_size > _STATE_LOG_MAX_BYTES:
+                self._write_state_snapshot()
+                os.remove(log_file)
         except Exception as e:
             print(f"Failed to save state: {e}")
     
-    def get_directory_size(self, path: Path) -> float:
-        """Get directory size in GB."""
-        if not path.exists():
-            return 0.0
+    def _write_state_snapshot(self):
+        """Write current alert states to the snapshot file."""
+        data = json.dumps(self.last_states, separators=(',', ':')).encode('utf-8')
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        # Atomic swap so a crash mid-write never leaves a torn file; no fsync, the state is
+        # rebuilt from the next check anyway
+        os.replace(tmp_file, self.state_file)
+    
+    def _scan_tree_size(self, root: str, exclude: Optional[str] = None) -> int:
+        """Sum disk space allocated to files under root in bytes, never descending into the exclude directory."""
+        root_dev = None
+        if self.one_file_system:
+            try:
+                root_dev = os.stat(root).st_dev
+            except OSError:
+                return 0
         
         total_size = 0
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.path == exclude:
+                                    continue
+                                # Mount point of another filesystem (bind, FUSE, overlay); leave it out
+                                if root_dev is not None and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                                    continue
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                # Allocated blocks, not st_size, so sparse files match du and statvfs
+                                total_size += entry.stat(follow_symlinks=False).st_blocks * 512
+                        except OSError:
+                            continue
+            except OSError:
+                # Unreadable directory (permissions, removed mid-walk); skip it like os.walk did
+                continue
+        
+        return total_size
+    
+    def _du_size(self, root: str, exclude: Optional[str] = None) -> Optional[int]:
+        """Get disk usage of root in bytes from coreutils du, or None if du is unusable.
+        
+        Raises subprocess.TimeoutExpired if du runs too long, so the check fails loudly.
+        """
+        # -D follows a symlinked root (e.g. ~/.layer moved to a bigger disk), as the scandir walk does
+        cmd = ['du', '-sD', '-B1']
+        if self.one_file_system:
+            cmd.append('--one-file-system')
+        if exclude:
+            cmd.append(f'--exclude={exclude}')
+        cmd.append(root)
+        
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        except OSError:
+            return None
+        
+        # A du stuck on a failing disk or stale mount means storage is in trouble; let the timeout
+        # propagate to the monitoring loop's error path rather than fall back to a slower walk
         try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except (OSError, FileNotFoundError):
-                        continue
-        except (OSError, PermissionError):
+            stdout, _ = proc.communicate(timeout=_DU_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            proc.kill()  # Not waited on: a du in uninterruptible I/O would block this thread as well
+            raise
+        
+        # du exits 1 when some entries were unreadable but still prints the total it could see
+        try:
+            return int(stdout.split()[0])
+        except (IndexError, ValueError):
+            return None
+    
+    def get_directory_size(self, path: Union[str, Path]) -> float:
+        """Get directory size in GB."""
+        root = os.fspath(path)
+        if not os.path.exists(root):
             return 0.0
         
-        return total_size / (1024**3)  # Convert to GB
+        total_size = self._du_size(root)
+        if total_size is None:
+            total_size = self._scan_tree_size(root)
+        
+        return total_size / _GB  # Convert to GB
     
     def get_home_dir_size_excluding_layer(self) -> float:
         """Get home directory size excluding ~/.layer in GB."""
-        layer_dir = self.home_dir / ".layer"
-        
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(self.home_dir):
-                # Skip .layer directory
-                if layer_dir.exists() and dirpath.startswith(str(layer_dir)):
-                    continue
-                
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except (OSError, FileNotFoundError):
-                        continue
-        except (OSError, PermissionError):
-            return 0.0
+        # Entry paths are built by joining onto the root string, so a plain comparison prunes .layer
+        total_size = self._du_size(self._home_str, exclude=self._layer_str)
+        if total_size is None:
+            total_size = self._scan_tree_size(self._home_str, exclude=self._layer_str)
         
-        return total_size / (1024**3)  # Convert to GB
+        return total_size / _GB  # Convert to GB
     
     def get_journal_size(self) -> float:
         """Get systemd journal logs size in GB."""
+        # Persistent journals live in /var/log/journal, volatile ones in /run/log/journal; count both
+        # like journalctl --disk-usage, since /var/log/journal often exists even with Storage=volatile
+        return sum(
+            self.get_directory_size(journal_dir)
+            for journal_dir in ('/var/log/journal', '/run/log/journal')
+            if os.path.isdir(journal_dir)
+        )
+    
+    def get_filesystem_used(self, path: Union[str, Path]) -> Optional[float]:
+        """Get used space in GB on the filesystem holding path, or None if it cannot be read."""
         try:
-            result = subprocess.run(
-                ['journalctl', '--disk-usage'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                # Parse output like "Archived and active journals take up 1.2G in the file system."
-                output = result.stdout.strip()
-                if "take up" in output:
-                    size_part = output.split("take up")[1].split("in the file system")[0].strip()
-                    
-                    # Extract number and unit
-                    import re
-                    match = re.search(r'(\d+\.?\d*)\s*([KMGT]?)B?', size_part)
-                    if match:
-                        size_value = float(match.group(1))
-                        unit = match.group(2).upper()
-                        
-                        # Convert to GB
-                        multipliers = {'': 1/(1024**3), 'K': 1/(1024**2), 'M': 1/1024, 'G': 1, 'T': 1024}
-                        return size_value * multipliers.get(unit, 1/(1024**3))
-        except Exception:
-            pass
-        
-        return 0.0
+            st = os.statvfs(path)
+        except OSError:
+            return None
+        return st.f_frsize * (st.f_blocks - st.f_bfree) / _GB
     
     def get_system_storage(self) -> Tuple[float, float, float]:
         """Get system storage usage percentage, free GB, total GB."""
         try:
-            total, used, free = shutil.disk_usage('/')
-            usage_percent = (used / total) * 100
-            free_gb = free / (1024**3)
-            total_gb = total / (1024**3)
-            return usage_percent, free_gb, total_gb
+            st = os.statvfs('/')
+            total = st.f_frsize * st.f_blocks
+            used = st.f_frsize * (st.f_blocks - st.f_bfree)  # Same accounting as shutil.disk_usage
+            free = st.f_frsize * st.f_bavail
+            return (used / total) * 100, free / _GB, total / _GB
         except Exception:
             return 0.0, 0.0, 0.0
     
-    def determine_alert_level(self, value: float, thresholds: Dict[str, float], is_percentage: bool = False) -> str:
-        """Determine alert level based on value and thresholds."""
-        if value >= thresholds['critical']:
+    def determine_alert_level(self, value: float, bounds: Tuple[float, float], is_percentage: bool = False) -> str:
+        """Determine alert level based on value and (warning, critical) bounds."""
+        warning, critical = bounds
+        if value >= critical:
             return 'critical'
-        elif value >= thresholds['warning']:
+        elif value >= warning:
             return 'warning'
         else:
             return 'normal'
     
+    def _get_webhook_connection(self) -> http.client.HTTPConnection:
+        """Return the kept-alive webhook connection, opening a new one if needed."""
+        if self._webhook_conn is None:
+            url = urllib.parse.urlsplit(self.webhook_url)
+            conn_cls = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+            self._webhook_conn = conn_cls(url.netloc, timeout=30)
+        return self._webhook_conn
+    
+    def _close_webhook_connection(self):
+        """Drop the webhook connection so the next send reconnects."""
+        if self._webhook_conn is not None:
+            self._webhook_conn.close()
+            self._webhook_conn = None
+    
     def send_discord_alert(self, message: str):
         """Send alert to Discord webhook."""
         try:
-            data = {"content": message}
-            req = urllib.request.Request(
-                self.webhook_url,
-                data=json.dumps(data).encode('utf-8'),
-                headers={
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'StorageMonitor/1.0'
-                }
-            )
+            # Build the payload bytes directly rather than serializing a wrapper dict
+            data = b'{"content":' + json.dumps(message).encode('utf-8') + b'}'
+            
+            url = urllib.parse.urlsplit(self.webhook_url)
+            path = f"{url.path}?{url.query}" if url.query else url.path
+            headers = {
+                'Content-Type': 'application/json',
+                'Content-Length': str(len(data)),
+                'User-Agent': 'StorageMonitor/1.0',
+                'Connection': 'keep-alive'
+            }
+            
+            # Discord and NAT boxes drop idle connections long before the next cycle, and a silently
+            # dropped socket only shows up as a timeout, so keep-alive reuse is limited to one burst
+            if (self._webhook_conn is not None
+                    and time.monotonic() - self._webhook_last_used > _WEBHOOK_IDLE_SECONDS):
+                self._close_webhook_connection()
+            
+            # A reused connection may have been closed by Discord while idle; reconnect once
+            reused = self._webhook_conn is not None
+            while True:
+                conn = self._get_webhook_connection()
+                try:
+                    conn.request('POST', path, body=data, headers=headers)
+                    response = conn.getresponse()
+                    response.read()  # Drain the body so the connection can be reused
+                    self._webhook_last_used = time.monotonic()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    self._close_webhook_connection()
+                    if not reused:
+                        raise
+                    reused = False
+                except Exception:
+                    # Timeouts and other failures may come after Discord got the post; don't resend
+                    self._close_webhook_connection()
+                    raise
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                if response.status == 204:
-                    print("Alert sent successfully")
-                else:
-                    print(f"Alert sent with status: {response.status}")
+            if response.will_close:
+                self._close_webhook_connection()
+            
+            if response.status == 204:
+                print("Alert sent successfully")
+            else:
+                print(f"Alert sent with status: {response.status}")
         except Exception as e:
             print(f"Failed to send Discord alert: {e}")
     
+    def pack_discord_messages(self, parts: List[str]) -> List[str]:
+        """Join message parts into as few Discord messages as fit the content length limit."""
+        messages = []
+        current = ""
+        for part in parts:
+            # A single oversized part is hard-split; everything else breaks at part boundaries
+            while len(part) > _DISCORD_MAX_CONTENT:
+                if current:
+                    messages.append(current)
+                    current = ""
+                messages.append(part[:_DISCORD_MAX_CONTENT])
+                part = part[_DISCORD_MAX_CONTENT:]
+            
+            if not current:
+                current = part
+            elif len(current) + 2 + len(part) <= _DISCORD_MAX_CONTENT:
+                current += "\n\n" + part
+            else:
+                messages.append(current)
+                current = part
+        
+        if current:
+            messages.append(current)
+        return messages
+    
     def format_alert_message(self, metric_name: str, value: float, unit: str, level: str, 
-                           threshold_warning: float, threshold_critical: float) -> str:
+                           threshold_warning: float, threshold_critical: float,
+                           estimated: bool = False) -> str:
         """Format alert message for Discord."""
-        emoji_map = {'warning': '⚠️', 'critical': '🚨', 'normal': '✅'}
-        emoji = emoji_map.get(level, '📊')
+        emoji = self.EMOJI_MAP.get(level, '📊')
         
         message = f"{emoji} **{self.server_name} - {metric_name}** - {level.upper()}\n"
-        message += f"Current: {value:.2f} {unit}\n"
+        message += f"Current: {'≤ ' if estimated else ''}{value:.2f} {unit}\n"
         message += f"Warning: {threshold_warning:.2f} {unit}\n"
         message += f"Critical: {threshold_critical:.2f} {unit}"
         
         return message
     
     def format_status_report(self, layer_size: float, home_size: float, journal_size: float, 
-                           sys_usage: float, sys_free: float, sys_total: float) -> str:
+                           sys_usage: float, sys_free: float, sys_total: float,
+                           layer_estimated: bool = False, home_estimated: bool = False) -> str:
         """Format a comprehensive status report for Discord."""
         message = f"**🪖 Storage Status for {self.server_name}**\n"
-        message += f"**Home Directory (excl .layer):** {home_size:.2f} GB\n"
-        message += f"**~/.layer Directory:** {layer_size:.2f} GB\n"
+        message += f"**Home Directory (excl .layer):** {'≤ ' if home_estimated else ''}{home_size:.2f} GB\n"
+        message += f"**~/.layer Directory:** {'≤ ' if layer_estimated else ''}{layer_size:.2f} GB\n"
         message += f"**Journal Logs:** {journal_size:.2f} GB\n"
         message += f"**System Storage:** {sys_usage:.1f}% used ({sys_free:.1f} GB free of {sys_total:.1f} GB total)\n\n"
 
         return message
     
-    def check_and_alert(self):
+    async def check_and_alert(self):
         """Main monitoring function."""
         print("Starting storage check...")
         
+        # A directory can't hold more than its filesystem has in use. When that is already below
+        # the warning threshold, report it as an upper bound and skip the walk. This only holds if
+        # the walk stays on that filesystem, so the shortcut is off when mounts are followed, and
+        # it is off when a status report will show the sizes, which need the real figures
+        layer_bound = home_bound = None
+        if self.one_file_system and not self.send_status_reports:
+            if os.path.exists(self._layer_str):
+                layer_bound = self.get_filesystem_used(self._layer_str)
+            home_bound = self.get_filesystem_used(self._home_str)
+        layer_estimated = layer_bound is not None and layer_bound < self._level_bounds['layer_dir'][0]
+        home_estimated = home_bound is not None and home_bound < self._level_bounds['home_dir'][0]
+        
+        # Run the probes concurrently; they are independent and spend their time blocked on I/O
+        layer_size, home_size, journal_size, (sys_usage, sys_free, sys_total) = await asyncio.gather(
+            _resolved(layer_bound) if layer_estimated
+            else asyncio.to_thread(self.get_directory_size, self._layer_str),
+            _resolved(home_bound) if home_estimated
+            else asyncio.to_thread(self.get_home_dir_size_excluding_layer),
+            asyncio.to_thread(self.get_journal_size),
+            asyncio.to_thread(self.get_system_storage)
+        )
+        
         # Check ~/.layer directory
-        layer_size = self.get_directory_size(self.home_dir / ".layer")
-        layer_level = self.determine_alert_level(layer_size, self.thresholds['layer_dir'])
+        layer_level = self.determine_alert_level(layer_size, self._level_bounds['layer_dir'])
         
         # Check home directory (excluding ~/.layer)
-        home_size = self.get_home_dir_size_excluding_layer()
-        home_level = self.determine_alert_level(home_size, self.thresholds['home_dir'])
+        home_level = self.determine_alert_level(home_size, self._level_bounds['home_dir'])
         
         # Check journal logs
-        journal_size = self.get_journal_size()
-        journal_level = self.determine_alert_level(journal_size, self.thresholds['journal_logs'])
+        journal_level = self.determine_alert_level(journal_size, self._level_bounds['journal_logs'])
         
         # Check system storage
-        sys_usage, sys_free, sys_total = self.get_system_storage()
-        sys_level = self.determine_alert_level(sys_usage, self.thresholds['system_storage'], True)
+        sys_level = self.determine_alert_level(sys_usage, self._level_bounds['system_storage'], True)
         
         # Print current status
-        print(f"~/.layer: {layer_size:.2f} GB ({layer_level})")
-        print(f"~/ (excl .layer): {home_size:.2f} GB ({home_level})")
+        print(f"~/.layer: {'<= ' if layer_estimated else ''}{layer_size:.2f} GB ({layer_level})")
+        print(f"~/ (excl .layer): {'<= ' if home_estimated else ''}{home_size:.2f} GB ({home_level})")
         print(f"Journal logs: {journal_size:.2f} GB ({journal_level})")
         print(f"System storage: {sys_usage:.1f}% used, {sys_free:.1f} GB free ({sys_level})")
         
@@ -218,13 +403,13 @@ class StorageMonitor:
         alerts_to_send = []
         
         metrics = [
-            ('layer_dir', '~/.layer Directory', layer_size, layer_level, 'GB'),
-            ('home_dir', 'Home Directory (excl .layer)', home_size, home_level, 'GB'),
-            ('journal_logs', 'Journal Logs', journal_size, journal_level, 'GB'),
-            ('system_storage', 'System Storage', sys_usage, sys_level, '%')
+            ('layer_dir', '~/.layer Directory', layer_size, layer_level, 'GB', layer_estimated),
+            ('home_dir', 'Home Directory (excl .layer)', home_size, home_level, 'GB', home_estimated),
+            ('journal_logs', 'Journal Logs', journal_size, journal_level, 'GB', False),
+            ('system_storage', 'System Storage', sys_usage, sys_level, '%', False)
         ]
         
-        for metric_key, metric_name, value, current_level, unit in metrics:
+        for metric_key, metric_name, value, current_level, unit, estimated in metrics:
             last_level = self.last_states.get(metric_key, 'normal')
             
             # Send alert if level changed and not normal, or if recovering from critical/warning
@@ -236,30 +421,33 @@ class StorageMonitor:
                 should_alert = True  # Recovery alert
             
             if should_alert:
-                thresholds = self.thresholds[metric_key]
+                warning, critical = self._level_bounds[metric_key]
                 message = self.format_alert_message(
-                    metric_name, value, unit, current_level,
-                    thresholds['warning'], thresholds['critical']
+                    metric_name, value, unit, current_level, warning, critical, estimated
                 )
                 alerts_to_send.append(message)
             
             # Update state
             self.last_states[metric_key] = current_level
         
-        # Send alerts
+        outgoing = []
         if alerts_to_send:
-            full_message = "\n\n".join(alerts_to_send)
-            self.send_discord_alert(full_message)
+            outgoing.extend(alerts_to_send)
         else:
             print("No alerts to send")
         
-        # Send status report if enabled
+        # Include status report if enabled
         if self.send_status_reports:
-            status_message = self.format_status_report(
+            outgoing.append(self.format_status_report(
                 layer_size, home_size, journal_size, 
-                sys_usage, sys_free, sys_total
-            )
-            self.send_discord_alert(status_message)
+                sys_usage, sys_free, sys_total,
+                layer_estimated, home_estimated
+            ).rstrip())
+        
+        # Send alerts and status report together, split only where Discord's length limit requires
+        for message in self.pack_discord_messages(outgoing):
+            await asyncio.to_thread(self.send_discord_alert, message)
+        if self.send_status_reports:
             print("Status report sent")
         
         # Save state
@@ -278,6 +466,7 @@ def main():
         check_interval = getattr(config, 'CHECK_INTERVAL_HOURS', 24)
         send_status_reports = getattr(config, 'SEND_STATUS_REPORTS', False)
         server_name = getattr(config, 'SERVER_NAME', 'Server')
+        one_file_system = getattr(config, 'ONE_FILE_SYSTEM', True)
     except ImportError:
         # Fallback configuration
         WEBHOOK_URL = "https://discord.com/api/webhooks/1394315684002922568/7WnbZRSVTvtNzlpvqSPVjg7j-FZ1yNnNB1AuMd7CTsEFNO80GXE6Qd8eVEJ980RjiDyU"  # Replace with your Discord webhook URL
@@ -286,6 +475,7 @@ def main():
         check_interval = 24  # Default to 24 hours
         send_status_reports = False  # Default to disabled
         server_name = 'Server'  # Default server name
+        one_file_system = True  # Default to not crossing into other mounts
     
     if WEBHOOK_URL == "YOUR_DISCORD_WEBHOOK_URL_HERE":
         print("Please set your Discord webhook URL!")
@@ -294,29 +484,36 @@ def main():
         print("2. Create config.py based on config_example.py")
         return
     
-    monitor = StorageMonitor(WEBHOOK_URL, state_file, send_status_reports, server_name)
+    if check_interval <= 0:
+        print(f"CHECK_INTERVAL_HOURS must be greater than 0 (got {check_interval})")
+        return
     
-    # Apply custom thresholds if provided
-    if custom_thresholds:
-        monitor.thresholds.update(custom_thresholds)
+    monitor = StorageMonitor(WEBHOOK_URL, state_file, send_status_reports, server_name, custom_thresholds,
+                             one_file_system)
     
     print(f"Storage Monitor started for '{server_name}'. Checking every {check_interval} hours.")
     print(f"Status reports: {'Enabled' if send_status_reports else 'Disabled'}")
     print("Press Ctrl+C to stop.")
     
-    # Run the monitoring loop
+    # Run the monitoring loop on a fixed cadence measured from a monotonic clock
+    interval_s = check_interval * 3600  # Convert hours to seconds
+    next_deadline = time.monotonic()
     while True:
+        retry_at = None
         try:
-            monitor.check_and_alert()
-            
-            # Wait for the specified interval (in seconds)
-            sleep_time = check_interval * 3600  # Convert hours to seconds
-            time.sleep(sleep_time)
-                    
+            asyncio.run(monitor.check_and_alert())
         except Exception as e:
             print(f"Error during monitoring: {e}")
-            # Wait 5 minutes before retrying on error
-            time.sleep(300)
+            # Retry in 5 minutes without shifting the regular schedule
+            retry_at = time.monotonic() + 300
+        
+        # Advance to the next slot still in the future, skipping any missed during a long check
+        now = time.monotonic()
+        while next_deadline <= now:
+            next_deadline += interval_s
+        
+        wake_at = next_deadline if retry_at is None else min(next_deadline, retry_at)
+        time.sleep(max(0.0, wake_at - time.monotonic()))
 
 
 if __name__ == "__main__":